@@ -1,57 +1,99 @@
+import io
 import os
-import boto3
+try:
+    from orjson import loads as loads_json
+except ImportError:
+    from json import loads as loads_json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def extract_pptx_text(file_path):
+SUMMARY_INPUT_CHARS = 3000
+
+# Module-level session survives warm invocations, so TLS connections are reused
+http_session = requests.Session()
+http_session.headers.update({"Content-Type": "application/json"})
+http_session.mount("https://", HTTPAdapter(
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}), raise_on_status=False
+    )
+))
+
+def extract_pptx_text(file_path, max_chars=SUMMARY_INPUT_CHARS):
     from pptx import Presentation
     prs = Presentation(file_path)
     text = []
+    collected = 0
     for slide in prs.slides:
         for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text:
-                text.append(shape.text)
+            shape_text = getattr(shape, "text", "")
+            if shape_text:
+                text.append(shape_text)
+                collected += len(shape_text) + 1
+                if collected >= max_chars:
+                    return '\n'.join(text)[:max_chars]
     return '\n'.join(text)
 
-def extract_pdf_text(file_path):
+def extract_pdf_text(file_path, max_chars=SUMMARY_INPUT_CHARS):
     import pdfplumber
+    text = []
+    collected = 0
     with pdfplumber.open(file_path) as pdf:
-        return ' '.join(page.extract_text() or '' for page in pdf.pages)
+        for page in pdf.pages:
+            page_text = page.extract_text() or ''
+            text.append(page_text)
+            collected += len(page_text) + 1
+            if collected >= max_chars:
+                break
+    return ' '.join(text)[:max_chars]
 
-def summarize_with_together(text):
+def summarize_with_together(text, max_chars=SUMMARY_INPUT_CHARS):
     TOGETHER_API_KEY = os.getenv('TOGETHER_API_KEY')
-    response = requests.post(
+    if len(text) > max_chars:
+        text = text[:max_chars]
+    response = http_session.post(
         "https://api.together.xyz/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {TOGETHER_API_KEY}",
-            "Content-Type": "application/json"
-        },
+        headers={"Authorization": f"Bearer {TOGETHER_API_KEY}"},
         json={
             "model": "meta-llama/Llama-3-8b-chat-hf",
-            "messages": [{"role": "user", "content": f"Summarize these notes:\n\n{text[:3000]}"}],
+            "messages": [{"role": "user", "content": f"Summarize these notes:\n\n{text}"}],
             "max_tokens": 350
         }
     )
-    output = response.json()
-    try:
-        return output["choices"][0]["message"]["content"]
-    except Exception:
-        return str(output)
+    # Let HTTP errors fail the invocation instead of saving the error body as a summary
+    response.raise_for_status()
+    output = loads_json(response.content)
+    return output["choices"][0]["message"]["content"]
+
+_s3_client = None
+
+def get_s3_client():
+    # Built on first use and kept for warm invocations
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client('s3')
+    return _s3_client
 
 def lambda_handler(event, context):
-    s3 = boto3.client('s3')
+    s3 = get_s3_client()
     bucket = event['Records'][0]['s3']['bucket']['name']
     key = event['Records'][0]['s3']['object']['key']
-    filename = '/tmp/input_file'
-    s3.download_file(bucket, key, filename)
 
     if key.lower().endswith('.pptx'):
-        text = extract_pptx_text(filename)
-        summary_filename = key.replace('.pptx', '_summary.txt')
+        extract_text, suffix = extract_pptx_text, '.pptx'
     elif key.lower().endswith('.pdf'):
-        text = extract_pdf_text(filename)
-        summary_filename = key.replace('.pdf', '_summary.txt')
+        extract_text, suffix = extract_pdf_text, '.pdf'
     else:
         return {'statusCode': 400, 'body': 'Unsupported file type'}
+    # S3 keys are opaque strings, so swap only the matched suffix rather than normalising a path
+    summary_filename = key[:-len(suffix)] + '_summary.txt'
+
+    # Read the object into memory rather than round-tripping it through /tmp
+    body = s3.get_object(Bucket=bucket, Key=key)['Body'].read()
+    text = extract_text(io.BytesIO(body))
 
     summary = summarize_with_together(text)
     s3.put_object(Bucket=bucket, Key=summary_filename, Body=summary.encode('utf-8'))
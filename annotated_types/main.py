@@ -1,11 +1,28 @@
 from dotenv import load_dotenv
 load_dotenv()
 import os
+import functools
+import itertools
+import importlib.util
+import multiprocessing
 from datetime import datetime, timedelta, timezone
-import json
-import pandas as pd
+import csv
+import hashlib
+import gzip
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from operator import itemgetter
+from pathlib import Path
+try:
+    from orjson import loads as loads_json
+except ImportError:
+    from json import loads as loads_json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import botocore
+from botocore.config import Config
 import boto3
 
 # ------------------ AWS CONFIG ------------------- #
@@ -13,90 +30,179 @@ REGION = os.getenv('AWS_REGION', 'us-east-1')
 S3_BUCKET = os.getenv('S3_BUCKET', 'smart-notes-uploads')
 DYNAMO_TABLE = os.getenv('DYNAMO_TABLE', '')  # Set a table name to activate DB logging
 TOGETHER_API_KEY = os.getenv('TOGETHER_API_KEY', '')
+SUMMARY_INPUT_CHARS = 3000  # only this much of a document is sent for summarization
+TOGETHER_MODEL = "meta-llama/Llama-3-8b-chat-hf"
+SUMMARY_CACHE_PREFIX = os.getenv('SUMMARY_CACHE_PREFIX', 'summary-cache/')  # S3 prefix for cached Together responses
+PDF_PARALLEL_MIN_PAGES = 16  # PDF pages read in-process before extraction moves to a process pool
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '16'))  # threads for concurrent Pricing family lookups
 # ------------------------------------------------- #
 
 # AWS Clients
-cloudwatch = boto3.client('cloudwatch', region_name=REGION)
-ec2 = boto3.client('ec2', region_name=REGION)
-pricing = boto3.client('pricing', region_name=REGION)
-s3 = boto3.client('s3', region_name=REGION)
-dynamodb = boto3.resource('dynamodb', region_name=REGION) if DYNAMO_TABLE else None
+# Pool covers the concurrent Pricing lookups; adaptive retries back off on throttling
+aws_config = Config(
+    max_pool_connections=max(50, ANALYSIS_WORKERS),
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+cloudwatch = boto3.client('cloudwatch', region_name=REGION, config=aws_config)
+ec2 = boto3.client('ec2', region_name=REGION, config=aws_config)
+pricing = boto3.client('pricing', region_name=REGION, config=aws_config)
+s3 = boto3.client('s3', region_name=REGION, config=aws_config)
+dynamodb = boto3.resource('dynamodb', region_name=REGION, config=aws_config) if DYNAMO_TABLE else None
+
+# Shared HTTP session so Together API calls reuse pooled TLS connections
+http_session = requests.Session()
+http_session.headers.update({"Content-Type": "application/json"})
+http_session.mount("https://", HTTPAdapter(
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}), raise_on_status=False
+    )
+))
 
 # --- EC2 COST OPTIMIZATION ----
 
-def get_instance_metrics(instance_id, days=14):
+METRIC_QUERY_LIMIT = 500  # GetMetricData accepts at most 500 queries per call
+
+def get_instances_metrics(instance_ids, days=14):
     end_time = datetime.now(timezone.utc)
     start_time = end_time - timedelta(days=days)
-    response = cloudwatch.get_metric_statistics(
-        Namespace='AWS/EC2',
-        MetricName='CPUUtilization',
-        Dimensions=[{'Name': 'InstanceId', 'Value': instance_id}],
-        StartTime=start_time,
-        EndTime=end_time,
-        Period=86400,
-        Statistics=['Average', 'Maximum'],
-        Unit='Percent'
-    )
-    datapoints = response.get('Datapoints', [])
-    if not datapoints:
-        return None, None
-    avg_util = sum(dp['Average'] for dp in datapoints) / len(datapoints)
-    max_util = max(dp['Maximum'] for dp in datapoints)
-    return avg_util, max_util
+    queries = [
+        {
+            'Id': f"m{i}_{stat.lower()}",
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': 'AWS/EC2',
+                    'MetricName': 'CPUUtilization',
+                    'Dimensions': [{'Name': 'InstanceId', 'Value': instance_id}]
+                },
+                'Period': 86400,
+                'Stat': stat,
+                'Unit': 'Percent'
+            },
+            'ReturnData': True
+        }
+        for i, instance_id in enumerate(instance_ids)
+        for stat in ('Average', 'Maximum')
+    ]
+    values = {}
+    for start in range(0, len(queries), METRIC_QUERY_LIMIT):
+        kwargs = {
+            'MetricDataQueries': queries[start:start + METRIC_QUERY_LIMIT],
+            'StartTime': start_time,
+            'EndTime': end_time
+        }
+        while True:
+            response = cloudwatch.get_metric_data(**kwargs)
+            for result in response.get('MetricDataResults', []):
+                values.setdefault(result['Id'], []).extend(result.get('Values', []))
+            if 'NextToken' not in response:
+                break
+            kwargs['NextToken'] = response['NextToken']
+    metrics = {}
+    for i, instance_id in enumerate(instance_ids):
+        averages = values.get(f"m{i}_average")
+        maximums = values.get(f"m{i}_maximum")
+        if not averages or not maximums:
+            metrics[instance_id] = (None, None)
+            continue
+        metrics[instance_id] = (sum(averages) / len(averages), max(maximums))
+    return metrics
+
+tag_key_value = itemgetter('Key', 'Value')
 
 def get_all_instances():
-    response = ec2.describe_instances(Filters=[{'Name': 'instance-state-name', 'Values': ['running']}])
-    instances = []
-    for reservation in response['Reservations']:
-        for instance in reservation['Instances']:
-            instances.append({
-                'InstanceId': instance['InstanceId'],
-                'InstanceType': instance['InstanceType'],
-                'LaunchTime': instance['LaunchTime'],
-                'Tags': {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-            })
-    return instances
+    paginator = ec2.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=[{'Name': 'instance-state-name', 'Values': ['running']}],
+        PaginationConfig={'PageSize': 500}
+    )
+    reservations = itertools.chain.from_iterable(page['Reservations'] for page in pages)
+    return [
+        {
+            'InstanceId': instance['InstanceId'],
+            'InstanceType': instance['InstanceType'],
+            'LaunchTime': instance['LaunchTime'],
+            'Tags': dict(map(tag_key_value, instance.get('Tags') or ()))
+        }
+        for instance in itertools.chain.from_iterable(r['Instances'] for r in reservations)
+    ]
 
-def get_instance_type_info(instance_type):
-    try:
-        response = pricing.get_products(
-            ServiceCode='AmazonEC2',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': 'US East (N. Virginia)'},
-                {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
-                {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
-                {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
-                {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'}
-            ],
-            MaxResults=1
-        )
-        if not response['PriceList']:
-            return None
-        price_item = json.loads(response['PriceList'][0])
-        terms = price_item['terms']['OnDemand']
-        term_keys = list(terms.keys())
-        price_dimensions = terms[term_keys[0]]['priceDimensions']
-        dimension_keys = list(price_dimensions.keys())
-        usd_price = price_dimensions[dimension_keys[0]]['pricePerUnit'].get('USD', None)
-        return float(usd_price) if usd_price else None
-    except Exception as e:
-        print(f"Error getting pricing for {instance_type}: {e}")
-        return None
+PRICING_FILTERS = (
+    {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': 'US East (N. Virginia)'},
+    {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
+    {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
+    {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
+    {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'}
+)
 
-def get_recommendations(instance, avg_util, max_util):
+def parse_on_demand_price(price_item):
+    terms = price_item['terms']['OnDemand']
+    term_keys = list(terms.keys())
+    price_dimensions = terms[term_keys[0]]['priceDimensions']
+    dimension_keys = list(price_dimensions.keys())
+    usd_price = price_dimensions[dimension_keys[0]]['pricePerUnit'].get('USD', None)
+    return float(usd_price) if usd_price else None
+
+# Prices rarely change within a run and most fleets repeat a handful of families.
+# Errors propagate so a failed lookup is never cached as an empty price list.
+@functools.lru_cache(maxsize=None)
+def get_family_prices(family):
+    prices = {}
+    paginator = pricing.get_paginator('get_products')
+    pages = paginator.paginate(
+        ServiceCode='AmazonEC2',
+        Filters=[{'Type': 'CONTAINS', 'Field': 'instanceType', 'Value': f"{family}."}, *PRICING_FILTERS]
+    )
+    for page in pages:
+        for raw_item in page['PriceList']:
+            try:
+                price_item = loads_json(raw_item)
+                instance_type = price_item['product']['attributes'].get('instanceType', '')
+                if not instance_type.startswith(f"{family}.") or instance_type in prices:
+                    continue
+                prices[instance_type] = parse_on_demand_price(price_item)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Skipping malformed price item for {family} family: {e}")
+    return prices
+
+def fetch_family_prices(instances, metrics):
+    # Only underutilized instances get downsize suggestions, so only their families are priced.
+    # A failed family maps to {} so nothing downstream retries it.
+    families = set()
+    for instance in instances:
+        _, max_util = metrics.get(instance['InstanceId'], (None, None))
+        if max_util is not None and max_util < 40:
+            families.add(instance['InstanceType'].split('.')[0])
+    families = sorted(families)
+
+    def fetch(family):
+        try:
+            return get_family_prices(family)
+        except Exception as e:
+            print(f"Error getting pricing for {family} family: {e}")
+            return {}
+
+    # Family lookups are the only per-item network calls left, so overlap them
+    with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+        return dict(zip(families, executor.map(fetch, families)))
+
+def get_recommendations(instance, avg_util, max_util, family_prices):
     recommendations = []
     current_type = instance['InstanceType']
     if max_util < 40:
         recommendations.append(f"Underutilized (Max CPU: {max_util:.1f}%)")
-        current_price = get_instance_type_info(current_type)
         family = current_type.split('.')[0]
-        potential_types = [f"{family}.large", f"{family}.medium", f"{family}.small"]
+        prices = family_prices.get(family, {})
+        current_price = prices.get(current_type)
+        # Without a baseline price no downsize can be compared, but the unused check below still applies
+        potential_types = [f"{family}.large", f"{family}.medium", f"{family}.small"] if current_price else []
         for new_type in potential_types:
             if new_type == current_type:
                 continue
-            new_price = get_instance_type_info(new_type)
-            if new_price and current_price and new_price < current_price:
+            new_price = prices.get(new_type)
+            if new_price and new_price < current_price:
                 savings = current_price - new_price
                 savings_percent = (savings / current_price) * 100
                 recommendations.append(
@@ -106,11 +212,23 @@ def get_recommendations(instance, avg_util, max_util):
         recommendations.append("Consider stopping: appears unused")
     return recommendations
 
-def upload_to_s3(file_name, bucket_name, object_name=None):
+def upload_to_s3(file_name, bucket_name, object_name=None, compress=False):
     if object_name is None:
-        object_name = os.path.basename(file_name)
+        object_name = os.path.basename(file_name) + ('.gz' if compress else '')
     try:
-        s3.upload_file(file_name, bucket_name, object_name)
+        if compress:
+            # Text reports shrink several-fold; readers honouring Content-Encoding decompress transparently
+            with open(file_name, "rb") as f:
+                body = gzip.compress(f.read(), compresslevel=6)
+            s3.put_object(
+                Bucket=bucket_name,
+                Key=object_name,
+                Body=body,
+                ContentEncoding='gzip',
+                ContentType=mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+            )
+        else:
+            s3.upload_file(file_name, bucket_name, object_name)
         print(f"✅ Uploaded to s3://{bucket_name}/{object_name}")
         return True
     except botocore.exceptions.ClientError as e:
@@ -125,108 +243,167 @@ def write_to_dynamodb(table_name, record):
     table.put_item(Item=record)
     print(f"✅ Record logged to DynamoDB table: {table_name}")
 
+def write_many_to_dynamodb(table_name, records):
+    if not dynamodb:
+        print("⚠️ DynamoDB not configured.")
+        return
+    table = dynamodb.Table(table_name)
+    # batch_writer chunks into 25-item BatchWriteItem calls and resends unprocessed items
+    with table.batch_writer(overwrite_by_pkeys=['InstanceId']) as batch:
+        for record in records:
+            batch.put_item(Item=record)
+    print(f"✅ {len(records)} record(s) logged to DynamoDB table: {table_name}")
+
+def analyze_instance(instance, metrics, family_prices):
+    instance_id = instance['InstanceId']
+    print(f" Analyzing {instance_id}...")
+    try:
+        avg_util, max_util = metrics.get(instance_id, (None, None))
+        if avg_util is None:
+            print(f" No metrics found for {instance_id}.")
+            return None
+        recommendations = get_recommendations(instance, avg_util, max_util, family_prices)
+        return {
+            'InstanceId': instance_id,
+            'Name': instance['Tags'].get('Name', ''),
+            'InstanceType': instance['InstanceType'],
+            'AvgCPU': round(avg_util, 1),
+            'MaxCPU': round(max_util, 1),
+            'Recommendations': "\n".join(recommendations) if recommendations else "✅ No recommendations"
+        }
+    except Exception as e:
+        print(f" Error with {instance_id}: {e}")
+        return None
+
 def analyze_instances(do_shutdown=None, do_start=None, dynamo_logging=False):
     print("\n AWS EC2 Instance Cost Optimization Tool")
     print("=" * 60)
     instances = get_all_instances()
     print(f"Found {len(instances)} running EC2 instance(s)\n")
-    results = []
-    for instance in instances:
-        instance_id = instance['InstanceId']
-        print(f" Analyzing {instance_id}...")
-        try:
-            avg_util, max_util = get_instance_metrics(instance_id)
-            if avg_util is None:
-                print(" No metrics found.")
-                continue
-            recommendations = get_recommendations(instance, avg_util, max_util)
-            results.append({
-                'InstanceId': instance_id,
-                'Name': instance['Tags'].get('Name', ''),
-                'InstanceType': instance['InstanceType'],
-                'AvgCPU': round(avg_util, 1),
-                'MaxCPU': round(max_util, 1),
-                'Recommendations': "\n".join(recommendations) if recommendations else "✅ No recommendations"
-            })
-        except Exception as e:
-            print(f" Error with {instance_id}: {e}")
-    df = pd.DataFrame(results)
-    if df.empty:
+    try:
+        metrics = get_instances_metrics([instance['InstanceId'] for instance in instances]) if instances else {}
+    except botocore.exceptions.ClientError as e:
+        print(f" Error fetching CloudWatch metrics: {e}")
+        metrics = {}
+    family_prices = fetch_family_prices(instances, metrics)
+    analyzed = (analyze_instance(instance, metrics, family_prices) for instance in instances)
+    results = [result for result in analyzed if result]
+    if not results:
         print("\n No data to export..............")
         return None
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
     file_name = f"aws_cost_optimization_report_{timestamp}.csv"
     full_path = os.path.abspath(file_name)
-    df.to_csv(file_name, index=False)
+    fieldnames = list(results[0].keys())
+    with open(file_name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(results)
     print("\n📄 Final Report:")
-    print(df.to_string(index=False))
+    print(" | ".join(fieldnames))
+    for record in results:
+        print(" | ".join(str(value).replace("\n", "; ") for value in record.values()))
     print(f"\n Report saved at: {full_path}")
-    uploaded = upload_to_s3(file_name, S3_BUCKET)
+    # The S3 client is thread-safe, so the upload runs alongside the summary; the DynamoDB
+    # resource is not, so every DynamoDB write stays on this thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upload_future = executor.submit(upload_to_s3, file_name, S3_BUCKET, compress=True)
+        # AI Summarize the report!
+        ai_summary_to_file(file_name)
+        uploaded = upload_future.result()
     if dynamo_logging and DYNAMO_TABLE:
+        created_at = datetime.now(timezone.utc).isoformat()
         for record in results:
-            record['created_at'] = datetime.now().isoformat()
-            write_to_dynamodb(DYNAMO_TABLE, record)
-    # AI Summarize the report!
-    ai_summary_to_file(file_name)
+            record['created_at'] = created_at
+        write_many_to_dynamodb(DYNAMO_TABLE, results)
     return {"file": file_name, "s3": uploaded, "items": results}
 
-def summarize_with_together(text):
+def summarize_with_together(text, max_chars=SUMMARY_INPUT_CHARS):
     if not TOGETHER_API_KEY:
         print("No Together API key set; skipping summarization.")
         return ""
-    response = requests.post(
-        "https://api.together.xyz/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {TOGETHER_API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": "meta-llama/Llama-3-8b-chat-hf",
-            "messages": [{"role": "user", "content": "Summarize this document:\n" + text[:3000]}],
-            "max_tokens": 350
-        }
-    )
-    output = response.json()
-    return output["choices"][0]["message"]["content"] if "choices" in output else str(output)
+    # Extractors already truncate, so only copy when handed an oversized string
+    if len(text) > max_chars:
+        text = text[:max_chars]
+    prompt = "Summarize this document:\n" + text
+    digest = hashlib.sha256(f"{TOGETHER_MODEL}\n{prompt}".encode("utf-8")).hexdigest()
+    cache_key = f"{SUMMARY_CACHE_PREFIX}{digest}.txt"
+    try:
+        cached = s3.get_object(Bucket=S3_BUCKET, Key=cache_key)
+        print(f"Using cached summary s3://{S3_BUCKET}/{cache_key}")
+        return cached['Body'].read().decode("utf-8")
+    except botocore.exceptions.ClientError:
+        pass
+    try:
+        response = http_session.post(
+            "https://api.together.xyz/v1/chat/completions",
+            headers={"Authorization": f"Bearer {TOGETHER_API_KEY}"},
+            json={
+                "model": TOGETHER_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 350
+            }
+        )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Together API request failed: {e}")
+        return ""
+    summary = loads_json(response.content)["choices"][0]["message"]["content"]
+    try:
+        s3.put_object(Bucket=S3_BUCKET, Key=cache_key, Body=summary.encode("utf-8"))
+    except botocore.exceptions.ClientError as e:
+        print(f"⚠️ Could not cache summary: {e}")
+    return summary
+
+def summary_path_for(file_path):
+    path = Path(file_path)
+    return str(path.with_name(path.stem + '_summary.txt'))
 
 def ai_summary_to_file(file_path):
     with open(file_path, "r", encoding="utf-8") as file:
-        content = file.read()
+        content = file.read(SUMMARY_INPUT_CHARS)
     summary = summarize_with_together(content)
     if summary.strip():
-        summary_path = file_path.replace('.csv', '_summary.txt').replace('.pdf', '_summary.txt').replace('.pptx', '_summary.txt')
+        summary_path = summary_path_for(file_path)
         with open(summary_path, "w", encoding="utf-8") as f:
             f.write(summary)
         print("\n====== AI SUMMARY OF FILE ======")
         print(summary)
         print(f"\nSummary also saved at: {summary_path}\n")
-        upload_to_s3(summary_path, S3_BUCKET)
-        # Log summary to DynamoDB as well (if active)
-        if DYNAMO_TABLE:
-            write_to_dynamodb(DYNAMO_TABLE, {
-                'filename': os.path.basename(summary_path),
-                'created_at': datetime.now().isoformat(),
-                'summary_preview': summary[:200]
-            })
+        summary_key = os.path.basename(summary_path) + '.gz'
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            upload_future = executor.submit(upload_to_s3, summary_path, S3_BUCKET, summary_key, compress=True)
+            # Log summary to DynamoDB as well (if active), on this thread while the upload runs
+            if DYNAMO_TABLE:
+                write_to_dynamodb(DYNAMO_TABLE, {
+                    'filename': os.path.basename(summary_path),
+                    'summary_s3_key': summary_key,
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                    'summary_preview': summary[:200]
+                })
+            upload_future.result()
     else:
         print("\n[!] Summary not generated.")
 
 # ----------- PPTX AND PDF SUMMARIZATION ------
-try:
-    from pptx import Presentation
-    HAS_PPTX = True
-except ImportError:
-    HAS_PPTX = False
+# Checked without importing so python-pptx is only loaded when a deck is summarized
+HAS_PPTX = importlib.util.find_spec("pptx") is not None
 
-def extract_text_from_pptx(filepath):
+def extract_text_from_pptx(filepath, max_chars=SUMMARY_INPUT_CHARS):
     if not HAS_PPTX:
         raise RuntimeError("python-pptx not installed.")
+    from pptx import Presentation
     prs = Presentation(filepath)
     text = []
+    collected = 0
     for slide in prs.slides:
         for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text:
-                text.append(shape.text)
+            shape_text = getattr(shape, "text", "")
+            if shape_text:
+                text.append(shape_text)
+                collected += len(shape_text) + 1
+                if collected >= max_chars:
+                    return "\n".join(text)[:max_chars]
     return "\n".join(text)
 
 def pptx_summarize_handler(file_path: str, output_txt: str = None):
@@ -236,7 +413,7 @@ def pptx_summarize_handler(file_path: str, output_txt: str = None):
     ppt_text = extract_text_from_pptx(file_path)
     summary = summarize_with_together(ppt_text)
     if not output_txt:
-        output_txt = file_path.replace('.pptx', '_summary.txt')
+        output_txt = summary_path_for(file_path)
     with open(output_txt, "w", encoding="utf-8") as f:
         f.write(summary)
     print(f"PPTX summary written to: {output_txt}")
@@ -245,17 +422,65 @@ def pptx_summarize_handler(file_path: str, output_txt: str = None):
         write_to_dynamodb(DYNAMO_TABLE, {
             'filename': os.path.basename(file_path),
             'summary_s3_key': os.path.basename(output_txt),
-            'created_at': datetime.now().isoformat(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
             'summary_preview': summary[:200]
         })
 
-def pdf_summarize_handler(file_path: str, output_txt: str = None):
+def _extract_pdf_page_range(args):
+    import pdfplumber
+    file_path, start, stop, max_chars = args
+    text = []
+    collected = 0
+    # Only this task's pages are loaded, so each task costs O(range) rather than O(document)
+    with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ''
+            text.append(page_text)
+            collected += len(page_text) + 1
+            if collected >= max_chars:
+                break
+    return '\n'.join(text)
+
+def extract_text_from_pdf(file_path, max_chars=SUMMARY_INPUT_CHARS):
     import pdfplumber
+    text = []
+    collected = 0
+    # A couple of pages usually cover the summary input, so start in-process
     with pdfplumber.open(file_path) as pdf:
-        text = '\n'.join(page.extract_text() or '' for page in pdf.pages)
+        page_count = len(pdf.pages)
+        for page in pdf.pages[:PDF_PARALLEL_MIN_PAGES]:
+            page_text = page.extract_text() or ''
+            text.append(page_text)
+            collected += len(page_text) + 1
+            if collected >= max_chars:
+                return '\n'.join(text)[:max_chars]
+    remaining = page_count - PDF_PARALLEL_MIN_PAGES
+    if remaining <= 0:
+        return '\n'.join(text)[:max_chars]
+    # Long, text-sparse documents (e.g. scans) fall through to worker processes since layout
+    # analysis is CPU-bound. Under the spawn start method (Windows, macOS) every worker re-imports
+    # this module, which loads .env and builds the AWS clients, hence the page threshold above.
+    workers = min(os.cpu_count() or 1, remaining)
+    step = -(-remaining // (workers * 2))
+    ranges = [
+        (file_path, start, min(start + step, page_count), max_chars - collected)
+        for start in range(PDF_PARALLEL_MIN_PAGES, page_count, step)
+    ]
+    # imap keeps document order and lets us stop after any range once enough text is collected
+    with multiprocessing.Pool(workers) if workers > 1 else nullcontext() as pool:
+        extracted = pool.imap(_extract_pdf_page_range, ranges) if pool else map(_extract_pdf_page_range, ranges)
+        for range_text in extracted:
+            text.append(range_text)
+            collected += len(range_text) + 1
+            if collected >= max_chars:
+                break
+    return '\n'.join(text)[:max_chars]
+
+def pdf_summarize_handler(file_path: str, output_txt: str = None):
+    text = extract_text_from_pdf(file_path)
     summary = summarize_with_together(text)
     if not output_txt:
-        output_txt = file_path.replace('.pdf', '_summary.txt')
+        output_txt = summary_path_for(file_path)
     with open(output_txt, "w", encoding="utf-8") as f:
         f.write(summary)
     print(f"PDF summary written to: {output_txt}")
@@ -264,7 +489,7 @@ def pdf_summarize_handler(file_path: str, output_txt: str = None):
         write_to_dynamodb(DYNAMO_TABLE, {
             'filename': os.path.basename(file_path),
             'summary_s3_key': os.path.basename(output_txt),
-            'created_at': datetime.now().isoformat(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
             'summary_preview': summary[:200]
         })
 